@@ -1,184 +1,160 @@
+from copy import copy
+
 import streamlit as st
-from pathlib import Path
-from loader import build_question_set
+
+from options import (
+    DEFAULTS,
+    WIDGET_DEFAULTS,
+    PAGES,
+    EMPLOYEE_RANGES,
+    SECTOR_LABEL_TO_KEY,
+    SECTOR_LABELS,
+    YEARS_OPTIONS,
+    IT_MANAGER_OPTIONS,
+    YES_PARTIALLY_NO_NOT_SURE,
+    YES_SOMETIMES_NO_NOT_SURE,
+    YES_NO_NOT_SURE,
+    YES_NO_PARTIALLY,
+    YES_SOMETIMES_NO,
+    YES_NO,
+    ANSWER_OPTIONS,
+    ANSWER_INDEX,
+    SCORE_MAP,
+    MAX_QUICK_WINS,
+    WORK_MODE_OPTIONS,
+    TURNOVER_STARTS,
+    digital_dependency,
+    results_header,
+    size_from_turnover_start,
+    snapshot_markdown,
+    status_from_avg,
+    turnover_label_from_start,
+)
 
 st.set_page_config(page_title="SME Cybersecurity Self-Assessment", layout="wide")
 
 # =========================
-# Session defaults
+# Session defaults (DEFAULTS lives in options.py)
 # =========================
-defaults = {
-    "page": "Landing",                 # Landing → Initial assessment → Questionnaire → Results
-    "person_name": "",
-    "company_name": "",
-    "employee_range": "1–5",
-    "turnover_start": 0,               # start of the selected 100k band (via dropdown)
-    "size": "micro",
-    "sector_label": "Retail & Hospitality",
-    "sector_key": "hospitality_retail",
-    "card_payments": True,
-    "personal_data": True,
-    "industrial_systems": False,
-
-    # Initial assessment extras (Business profile + Digital footprint)
-    "bp_it_manager": "Self-managed",
-    "bp_asset_inventory": "Partially",
-    "bp_byod": "Sometimes",
-    "bp_sensitive_data": "Yes",
-    "dp_has_website": "Yes",
-    "dp_https": "Yes",
-    "dp_business_email": "Yes",
-    "dp_social_media": "Yes",
-    "dp_public_review": "Sometimes",
-
-    # Snapshot-related inputs
-    "years_in_business": "<1 year",
-    "work_mode": "Local & in-person",
-
-    "questions": [],
-    "answers": {},                     # {question_id: "Yes" | "Partially or unsure" | "No"}
-    "q_index": 0,                      # current question index
-    "debug": False,
-}
-for k, v in defaults.items():
-    st.session_state.setdefault(k, v)
+# One set difference per rerun instead of a setdefault per key. Unlike a single sentinel
+# key it also restores any single default that has gone missing.
+# DEFAULTS is shared by every session, so each gets its own copy of the {} / [] values.
+for k in DEFAULTS.keys() - st.session_state.keys():
+    st.session_state[k] = copy(DEFAULTS[k])
+# Streamlit drops a keyed widget's state once the widget stops rendering, i.e. on another
+# page. On the first run of a new page each widget-owned value is deleted and set again:
+# that unlinks it from its old widget so it is kept as plain state until a widget with the
+# same key renders. Runs that stay on the same page skip this.
+if st.session_state.page != st.session_state.rendered_page:
+    for k in WIDGET_DEFAULTS:
+        value = st.session_state[k]
+        del st.session_state[k]
+        st.session_state[k] = value
+    st.session_state.rendered_page = st.session_state.page
 
 # =========================
-# Options & helpers
+# Helpers (options, lookup tables and pure formatters live in options.py)
 # =========================
-EMPLOYEE_RANGES = ["1–5", "6–10", "10–25", "26–50", "51–100", "More than 100"]
-
-SECTOR_LABEL_TO_KEY = {
-    "Retail & Hospitality": "hospitality_retail",
-    "Professional / Consulting / Legal / Accounting": "professional_services",
-    "Manufacturing / Logistics": "manufacturing_logistics",
-    "Creative / Marketing / IT Services": "creative_digital_marketing",
-    "Health / Wellness / Education": "health_wellness_education",
-    "Others (default generic set)": "other_generic",  # no sector file; generic only
-}
-SECTOR_LABELS = list(SECTOR_LABEL_TO_KEY.keys())
-
-YEARS_OPTIONS = ["<1 year", "1–3 years", "4–10 years", "10+ years"]
-WORK_MODE_OPTIONS = ["Local & in-person", "Online/remote", "A mix of both"]
-
-def euro_short(n: int) -> str:
-    # 100_000 -> "€100k", 5_000_000 -> "€5.0M"
-    if n >= 1_000_000:
-        return f"€{n/1_000_000:.1f}M"
-    return f"€{n//1000}k"
-
-def euro_fmt(n: int) -> str:
-    if n >= 1_000_000:
-        return f"{n//1_000_000} million euro"
-    return f"{n//1_000} thousand euro"
-
-# 100k-step bands 0 → 9.9M, then two sentinels for larger buckets
-TURNOVER_STARTS_100K = list(range(0, 10_000_000, 100_000))  # 0, 100k, ..., 9.9M
-TURNOVER_SENTINELS = [10_000_000, 50_000_000]                # 10–<50M, 50M+
-TURNOVER_STARTS_ALL = TURNOVER_STARTS_100K + TURNOVER_SENTINELS
-
-def turnover_label_from_start(start: int) -> str:
-    if start < 100_000:
-        return "<€100k"
-    if start < 10_000_000:
-        return euro_short(start)
-    if start == 10_000_000:
-        return "€10.0M–<€50.0M"
-    return "€50.0M+"
-
-def start_from_turnover_label(label: str) -> int:
-    if label == "<€100k":
-        return 0
-    if label == "€10.0M–<€50.0M":
-        return 10_000_000
-    if label == "€50.0M+":
-        return 50_000_000
-    raw = label.replace("€", "")
-    if raw.endswith("k"):
-        return int(float(raw[:-1])) * 1000
-    if raw.endswith("M"):
-        return int(float(raw[:-1]) * 1_000_000)
-    return 0
-
-def build_turnover_dropdown_options():
-    # Starts at 100k, then 200k, ..., 9.9M; plus <€100k and the two big buckets
-    opts = ["<€100k"]
-    for v in range(100_000, 10_000_000, 100_000):
-        opts.append(euro_short(v))
-    opts.extend(["€10.0M–<€50.0M", "€50.0M+"])
-    return opts
-
-TURNOVER_DROPDOWN = build_turnover_dropdown_options()
-
-def size_from_turnover_start(start: int) -> str:
-    if start < 2_000_000:
-        return "micro"
-    if start < 10_000_000:
-        return "small"
-    return "medium"  # 10–<50M and 50M+ treated as medium
-
 def derive_digital_dependency() -> str:
-    """
-    Simple heuristic based on inputs commonly linked to online reliance.
-    Score (0–5):
-      +1 card_payments, +1 personal_data, +2 industrial_systems,
-      +1 if turnover >= €1M, +1 if employees >= 51.
-    """
-    score = 0
-    score += 1 if st.session_state.card_payments else 0
-    score += 1 if st.session_state.personal_data else 0
-    score += 2 if st.session_state.industrial_systems else 0
-    score += 1 if st.session_state.turnover_start >= 1_000_000 else 0
-    # employees rough check
-    emp = st.session_state.employee_range
-    if emp in ["51–100", "More than 100"]:
-        score += 1
-    if score <= 1:
-        return "Low"
-    if score <= 3:
-        return "Medium"
-    return "High"
+    return digital_dependency(
+        st.session_state.card_payments,
+        st.session_state.personal_data,
+        st.session_state.industrial_systems,
+        st.session_state.turnover_start,
+        st.session_state.employee_range,
+    )
+
+# at most 3 sizes × 7 sectors × 8 overlay combinations per files_mtime; the cap also
+# evicts entries left behind by question-file edits
+@st.cache_resource(show_spinner=False, max_entries=3 * 7 * 8)
+def _load_questions(size: str, sector_key: str, overlay_items: tuple, files_mtime: int):
+    # Cached per profile and shared by every session without a pickle round trip; safe because
+    # Question tuples are immutable and the set comes back as tuples.
+    # files_mtime is only part of the key, so editing a question file invalidates the entry.
+    # Imported here so Landing / Initial assessment runs never touch the loader.
+    from pathlib import Path
+    from loader import build_question_set
+
+    qs, debug_log = build_question_set(
+        base_dir=Path("."),
+        size=size,
+        sector=sector_key,  # "other_generic" → no sector add-ins
+        overlay_flags=dict(overlay_items),
+    )
+    return tuple(qs), tuple(debug_log)
 
 def build_questions_now():
+    from pathlib import Path
+    from loader import question_files_mtime
+
+    ss = st.session_state
     overlay_flags = {
-        "payment_card_industry_data_security_standard": st.session_state.card_payments,
-        "general_data_protection_regulation": st.session_state.personal_data,
-        "operational_technology_and_industrial_control": st.session_state.industrial_systems,
+        "payment_card_industry_data_security_standard": ss.card_payments,
+        "general_data_protection_regulation": ss.personal_data,
+        "operational_technology_and_industrial_control": ss.industrial_systems,
     }
-    qs, debug_log = build_question_set(
-        base_dir=Path("."),
-        size=st.session_state.size,
-        sector=st.session_state.sector_key,  # "other_generic" → no sector add-ins
-        overlay_flags=overlay_flags,
+    questions_key = (
+        ss.size,
+        ss.sector_key,
+        tuple(sorted(overlay_flags.items())),
     )
-    st.session_state.questions = qs
-    st.session_state.q_index = 0
-    if st.session_state.debug:
-        st.toast(f"Loaded {len(qs)} questions for {st.session_state.size} / {st.session_state.sector_key}")
+    if questions_key == ss.questions_key and ss.questions:
+        return  # same profile: keep the loaded set and the current question index
+    qs, debug_log = _load_questions(*questions_key, question_files_mtime(Path(".")))
+    ss.questions = qs
+    ss.questions_key = questions_key
+    ss.questions_by_id = {q.id: q for q in qs}
+    ss.question_ids = [q.id for q in qs]
+    # answers can predate this set (e.g. after a profile change), so totals start from them
+    ss.section_totals = _section_totals(qs, ss.answers)
+    # eligibility is worked out from the weights when the question file is validated
+    ss.qw_candidates = tuple(i for i, q in enumerate(qs) if q.quick_win_eligible)
+    ss.q_index = 0
+    if ss.debug:
+        st.toast(f"Loaded {len(qs)} questions for {ss.size} / {ss.sector_key}")
         for line in debug_log:
             st.write(line)
 
-def score_choice(choice: str) -> int:
-    return {"Yes": 2, "Partially or unsure": 1, "No": 0}[choice]
-
-def status_from_avg(avg: float) -> str:
-    if avg >= 1.6:
-        return "🟩 Good"
-    if avg >= 0.8:
-        return "🟨 Needs improvement"
-    return "🟥 At risk"
+def _section_totals(qs: tuple, answers: dict) -> dict:
+    # {section: [score sum, question count]}, seeded A–Z so Results can list it as-is
+    totals = {s: [0, 0] for s in sorted({q.section for q in qs})}
+    for q in qs:
+        bucket = totals[q.section]
+        bucket[0] += SCORE_MAP[answers.get(q.id, "Partially or unsure")]
+        bucket[1] += 1
+    return totals
+
+def _set_answer(qid: str, choice: str):
+    # every answer write goes through here so the section totals stay in step
+    ss = st.session_state
+    old = ss.answers.get(qid, "Partially or unsure")
+    ss.answers[qid] = choice
+    ss.section_totals[ss.questions_by_id[qid].section][0] += SCORE_MAP[choice] - SCORE_MAP[old]
+
+def _store_answer(qid: str, radio_key: str):
+    # on_change callback: only a changed radio writes to the answers dict
+    _set_answer(qid, st.session_state[radio_key])
+
+def _go_to_question(i: int):
+    # on_click callback: Streamlit reruns after it, so no explicit st.rerun()
+    st.session_state.q_index = i
+
+def _jump_to_question():
+    st.session_state.q_index = st.session_state.q_jump - 1
 
 # --------- Shared UI bits
 def render_snapshot():
     with st.container():
         st.subheader("Snapshot")
         st.markdown(
-            f"**Business:** {st.session_state.company_name or '—'}  \n"
-            f"**Industry:** {st.session_state.sector_label or '—'}  \n"
-            f"**People:** {st.session_state.employee_range or '—'}  • "
-            f"**Years:** {st.session_state.years_in_business or '—'}  • "
-            f"**Turnover:** {turnover_label_from_start(st.session_state.turnover_start)}  \n"
-            f"**Work mode:** {st.session_state.work_mode or '—'}"
+            snapshot_markdown(
+                st.session_state.company_name,
+                st.session_state.sector_label,
+                st.session_state.employee_range,
+                st.session_state.years_in_business,
+                st.session_state.turnover_start,
+                st.session_state.work_mode,
+            )
         )
         st.markdown("---")
         dep = derive_digital_dependency()
@@ -190,265 +166,314 @@ def _restart():
     # reset volatile fields; keep current page
     keep_page = st.session_state.page
     st.session_state.clear()
-    for k, v in defaults.items():
-        st.session_state.setdefault(k, v)
+    st.session_state.update({k: copy(v) for k, v in DEFAULTS.items()})
     st.session_state.page = keep_page
 
 # =========================
 # Sidebar navigation
 # =========================
+def _navigate():
+    # on_change callback: runs before the rerun Streamlit already schedules, so no st.rerun()
+    st.session_state.page = st.session_state.nav
+
 with st.sidebar:
     st.header("Navigation")
-    nav = st.radio(
-        "Go to",
-        ["Landing", "Initial assessment", "Questionnaire", "Results"],
-        index=["Landing", "Initial assessment", "Questionnaire", "Results"].index(st.session_state.page),
-    )
-    if nav != st.session_state.page:
-        st.session_state.page = nav
-        st.rerun()
+    # page buttons change st.session_state.page directly; mirror it into the radio before it renders
+    st.session_state.nav = st.session_state.page
+    st.radio("Go to", PAGES, key="nav", on_change=_navigate)
     st.markdown("---")
     st.checkbox("Show debug info", key="debug")
 
 # ==========================================================
 # PAGE: Landing
 # ==========================================================
-if st.session_state.page == "Landing":
+def _update_derived():
+    # sector_key and size follow the widget-owned sector_label and turnover_start
+    ss = st.session_state
+    ss.sector_key = SECTOR_LABEL_TO_KEY.get(ss.sector_label, "other_generic")
+    ss.size = size_from_turnover_start(ss.turnover_start)
+
+def render_landing():
+    ss = st.session_state
     st.title("SME Self-Assessment Wizard")
     st.subheader("First, tell us a bit about the business (≈2 minutes)")
 
     c1, c2 = st.columns(2)
     with c1:
-        st.session_state.person_name = st.text_input(
+        st.text_input(
             "Your name",
-            value=st.session_state.person_name,
             placeholder="First Last",
+            key="person_name",
         )
         # REQUIRED business name (no “optional”)
-        st.session_state.company_name = st.text_input(
+        st.text_input(
             "Business name",
-            value=st.session_state.company_name,
             placeholder="Example Consulting Ltd",
+            key="company_name",
         )
-        st.session_state.sector_label = st.text_input(
+        st.text_input(
             "Industry / core service (e.g., retail, consulting)",
-            value=st.session_state.sector_label,
             placeholder="Retail & Hospitality",
-        )
-        st.session_state.sector_key = SECTOR_LABEL_TO_KEY.get(
-            st.session_state.sector_label, "other_generic"
+            key="sector_label",
+            on_change=_update_derived,
         )
 
     with c2:
-        st.session_state.years_in_business = st.selectbox(
+        st.selectbox(
             "How long in business?",
             YEARS_OPTIONS,
-            index=YEARS_OPTIONS.index(st.session_state.years_in_business),
+            key="years_in_business",
         )
         # employees — updated ranges
-        try:
-            emp_index = EMPLOYEE_RANGES.index(st.session_state.employee_range)
-        except ValueError:
-            emp_index = 0
-        st.session_state.employee_range = st.selectbox(
+        st.selectbox(
             "How many people (incl. contractors)?",
             EMPLOYEE_RANGES,
-            index=emp_index,
+            key="employee_range",
         )
-        current_label = turnover_label_from_start(st.session_state.turnover_start)
-        try:
-            t_index = build_turnover_dropdown_options().index(current_label)
-        except ValueError:
-            t_index = 0
-        chosen_label = st.selectbox(
+        st.selectbox(
             "Approx. annual turnover",
-            build_turnover_dropdown_options(),
-            index=t_index,
+            TURNOVER_STARTS,
+            format_func=turnover_label_from_start,
+            key="turnover_start",
+            on_change=_update_derived,
         )
-        st.session_state.turnover_start = start_from_turnover_label(chosen_label)
 
-    st.session_state.work_mode = st.radio(
+    st.radio(
         "Would you describe your business as mostly…",
         WORK_MODE_OPTIONS,
         horizontal=True,
-        index=WORK_MODE_OPTIONS.index(st.session_state.work_mode),
+        key="work_mode",
     )
 
     st.markdown(
         "_We’ll tailor the next questions based on this._"
     )
-    disabled = (st.session_state.company_name.strip() == "")
+    disabled = (ss.company_name.strip() == "")
     if st.button("Start Initial Assessment", type="primary", disabled=disabled):
-        st.session_state.page = "Initial assessment"
+        ss.page = "Initial assessment"
         st.rerun()
 
 # ==========================================================
 # PAGE: Initial assessment
 # ==========================================================
-if st.session_state.page == "Initial assessment":
+def render_initial_assessment():
+    ss = st.session_state
     st.title("Initial assessment")
-
-    # snapshot + form columns
-    snap_col, col1, col2 = st.columns([1, 2, 2], vertical_alignment="top")
+    # Landing takes free text for the industry; the Sector selectbox below needs a listed one
+    if ss.sector_label not in SECTOR_LABEL_TO_KEY:
+        ss.sector_label = SECTOR_LABELS[0]
+    # widgets inside a form cannot take on_change, so derived values are refreshed per render
+    _update_derived()
+
+    # snapshot + form columns; the inputs live in one form so edits submit together
+    snap_col, form_col = st.columns([1, 4], vertical_alignment="top")
     with snap_col:
         render_snapshot()
 
-    with col1:
-        st.session_state.person_name = st.text_input(
-            "Your name (person completing this assessment)",
-            value=st.session_state.person_name,
-            placeholder="First Last",
-        )
-        # REQUIRED
-        st.session_state.company_name = st.text_input(
-            "Business name",
-            value=st.session_state.company_name,
-            placeholder="Example Consulting Ltd",
-        )
-        try:
-            emp_index = EMPLOYEE_RANGES.index(st.session_state.employee_range)
-        except ValueError:
-            emp_index = 0
-        st.session_state.employee_range = st.selectbox(
-            "Number of employees (choose a range)",
-            EMPLOYEE_RANGES,
-            index=emp_index,
-            help="A range is enough for this assessment.",
-        )
-        st.session_state.years_in_business = st.selectbox(
-            "How long in business?",
-            YEARS_OPTIONS,
-            index=YEARS_OPTIONS.index(st.session_state.years_in_business),
-        )
-        # turnover — dropdown in €100k steps
-        current_label = turnover_label_from_start(st.session_state.turnover_start)
-        try:
-            t_index = build_turnover_dropdown_options().index(current_label)
-        except ValueError:
-            t_index = 0
-        chosen_label = st.selectbox(
-            "Approx. annual turnover (choose a value)",
-            build_turnover_dropdown_options(),
-            index=t_index,
-            help="Dropdown in €100k steps (no slider).",
-        )
-        st.session_state.turnover_start = start_from_turnover_label(chosen_label)
-        st.session_state.size = size_from_turnover_start(st.session_state.turnover_start)
-        st.info(f"Detected enterprise size: **{st.session_state.size.capitalize()}**")
-
-    with col2:
-        st.session_state.sector_label = st.selectbox(
-            "Sector",
-            SECTOR_LABELS,
-            index=SECTOR_LABELS.index(st.session_state.sector_label) if st.session_state.sector_label in SECTOR_LABELS else 0,
-            help="“Others” will load the generic set without sector-specific questions.",
-        )
-        st.session_state.sector_key = SECTOR_LABEL_TO_KEY.get(st.session_state.sector_label, "other_generic")
+    with form_col, st.form("initial_assessment", clear_on_submit=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.text_input(
+                "Your name (person completing this assessment)",
+                placeholder="First Last",
+                key="person_name",
+            )
+            # REQUIRED
+            st.text_input(
+                "Business name",
+                placeholder="Example Consulting Ltd",
+                key="company_name",
+            )
+            st.selectbox(
+                "Number of employees (choose a range)",
+                EMPLOYEE_RANGES,
+                help="A range is enough for this assessment.",
+                key="employee_range",
+            )
+            st.selectbox(
+                "How long in business?",
+                YEARS_OPTIONS,
+                key="years_in_business",
+            )
+            # turnover — dropdown in €100k steps
+            st.selectbox(
+                "Approx. annual turnover (choose a value)",
+                TURNOVER_STARTS,
+                format_func=turnover_label_from_start,
+                help="Dropdown in €100k steps (no slider).",
+                key="turnover_start",
+            )
+            st.info(f"Detected enterprise size: **{ss.size.capitalize()}**")
+
+        with col2:
+            st.selectbox(
+                "Sector",
+                SECTOR_LABELS,
+                help="“Others” will load the generic set without sector-specific questions.",
+                key="sector_label",
+            )
 
-        st.session_state.card_payments = st.checkbox(
-            "We accept card payments or use point of sale systems",
-            value=st.session_state.card_payments,
-        )
-        st.session_state.personal_data = st.checkbox(
-            "We process personal data of individuals in the European Union",
-            value=st.session_state.personal_data,
-        )
-        st.session_state.industrial_systems = st.checkbox(
-            "We use production or control systems connected to networks",
-            value=st.session_state.industrial_systems,
-        )
-        st.session_state.work_mode = st.radio(
-            "Work mode",
-            WORK_MODE_OPTIONS,
-            horizontal=True,
-            index=WORK_MODE_OPTIONS.index(st.session_state.work_mode),
-        )
+            st.checkbox(
+                "We accept card payments or use point of sale systems",
+                key="card_payments",
+            )
+            st.checkbox(
+                "We process personal data of individuals in the European Union",
+                key="personal_data",
+            )
+            st.checkbox(
+                "We use production or control systems connected to networks",
+                key="industrial_systems",
+            )
+            st.radio(
+                "Work mode",
+                WORK_MODE_OPTIONS,
+                horizontal=True,
+                key="work_mode",
+            )
 
-    # ---- Business profile & Digital footprint (from the reference sheet)
-    st.markdown("---")
-    bp, df = st.columns(2)
-
-    with bp:
-        st.subheader("Section 1 — Business profile")
-        st.caption("Purpose: understand organizational size, structure, and IT management context.")
-        st.session_state.bp_it_manager = st.selectbox(
-            "Who manages your IT systems?",
-            ["Self-managed", "Outsourced IT", "Shared responsibility", "Not sure"],
-            index=["Self-managed", "Outsourced IT", "Shared responsibility", "Not sure"].index(st.session_state.bp_it_manager),
-        )
-        st.session_state.bp_asset_inventory = st.radio(
-            "Do you have an inventory of company devices (laptops, phones, servers)?",
-            ["Yes", "Partially", "No", "Not sure"],
-            horizontal=True,
-            index=["Yes", "Partially", "No", "Not sure"].index(st.session_state.bp_asset_inventory),
-        )
-        st.session_state.bp_byod = st.radio(
-            "Do employees use personal devices (BYOD) for work?",
-            ["Yes", "Sometimes", "No", "Not sure"],
-            horizontal=True,
-            index=["Yes", "Sometimes", "No", "Not sure"].index(st.session_state.bp_byod),
-        )
-        st.session_state.bp_sensitive_data = st.radio(
-            "Do you handle sensitive customer or financial data?",
-            ["Yes", "No", "Not sure"],
-            horizontal=True,
-            index=["Yes", "No", "Not sure"].index(st.session_state.bp_sensitive_data),
-        )
+        # ---- Business profile & Digital footprint (from the reference sheet)
+        st.markdown("---")
+        bp, df = st.columns(2)
+
+        with bp:
+            st.subheader("Section 1 — Business profile")
+            st.caption("Purpose: understand organizational size, structure, and IT management context.")
+            st.selectbox(
+                "Who manages your IT systems?",
+                IT_MANAGER_OPTIONS,
+                key="bp_it_manager",
+            )
+            st.radio(
+                "Do you have an inventory of company devices (laptops, phones, servers)?",
+                YES_PARTIALLY_NO_NOT_SURE,
+                horizontal=True,
+                key="bp_asset_inventory",
+            )
+            st.radio(
+                "Do employees use personal devices (BYOD) for work?",
+                YES_SOMETIMES_NO_NOT_SURE,
+                horizontal=True,
+                key="bp_byod",
+            )
+            st.radio(
+                "Do you handle sensitive customer or financial data?",
+                YES_NO_NOT_SURE,
+                horizontal=True,
+                key="bp_sensitive_data",
+            )
 
-    with df:
-        st.subheader("Section 2 — Digital footprint")
-        st.caption("Purpose: identify online exposure and brand presence.")
-        st.session_state.dp_has_website = st.radio(
-            "Does your business have a public website?",
-            ["Yes", "No"],
-            horizontal=True,
-            index=["Yes", "No"].index(st.session_state.dp_has_website),
-        )
-        st.session_state.dp_https = st.radio(
-            "Is your website protected with HTTPS (padlock symbol)?",
-            ["Yes", "No", "Not sure"],
-            horizontal=True,
-            index=["Yes", "No", "Not sure"].index(st.session_state.dp_https),
-        )
-        st.session_state.dp_business_email = st.radio(
-            "Do you use business email addresses (e.g., info@yourcompany.com)?",
-            ["Yes", "No", "Partially"],
-            horizontal=True,
-            index=["Yes", "No", "Partially"].index(st.session_state.dp_business_email),
-        )
-        st.session_state.dp_social_media = st.radio(
-            "Is your business present on social media platforms?",
-            ["Yes", "No"],
-            horizontal=True,
-            index=["Yes", "No"].index(st.session_state.dp_social_media),
-        )
-        st.session_state.dp_public_review = st.radio(
-            "Do you regularly review what company or employee info is publicly visible online?",
-            ["Yes", "Sometimes", "No"],
-            horizontal=True,
-            index=["Yes", "Sometimes", "No"].index(st.session_state.dp_public_review),
-        )
+        with df:
+            st.subheader("Section 2 — Digital footprint")
+            st.caption("Purpose: identify online exposure and brand presence.")
+            st.radio(
+                "Does your business have a public website?",
+                YES_NO,
+                horizontal=True,
+                key="dp_has_website",
+            )
+            st.radio(
+                "Is your website protected with HTTPS (padlock symbol)?",
+                YES_NO_NOT_SURE,
+                horizontal=True,
+                key="dp_https",
+            )
+            st.radio(
+                "Do you use business email addresses (e.g., info@yourcompany.com)?",
+                YES_NO_PARTIALLY,
+                horizontal=True,
+                key="dp_business_email",
+            )
+            st.radio(
+                "Is your business present on social media platforms?",
+                YES_NO,
+                horizontal=True,
+                key="dp_social_media",
+            )
+            st.radio(
+                "Do you regularly review what company or employee info is publicly visible online?",
+                YES_SOMETIMES_NO,
+                horizontal=True,
+                key="dp_public_review",
+            )
 
-    st.markdown("---")
-    c1, c2 = st.columns(2)
-    if c1.button("⬅ Back to landing"):
-        st.session_state.page = "Landing"
-        st.rerun()
-    if c2.button("Continue to questionnaire ➜", type="primary", disabled=(st.session_state.company_name.strip() == "")):
-        build_questions_now()
-        st.session_state.page = "Questionnaire"
+        st.markdown("---")
+        # Back submits too, so edits made before leaving the page are kept
+        c1, c2 = st.columns([1, 1])
+        back = c1.form_submit_button("⬅ Back to landing")
+        submitted = c2.form_submit_button("Continue to questionnaire ➜", type="primary")
+
+    if back:
+        ss.page = "Landing"
         st.rerun()
+    if submitted:
+        if ss.company_name.strip() == "":
+            st.warning("Please enter the business name before continuing.")
+        else:
+            build_questions_now()
+            ss.page = "Questionnaire"
+            st.rerun()
 
 # ==========================================================
 # PAGE: Questionnaire — single question at a time
 # ==========================================================
-if st.session_state.page == "Questionnaire":
-    if not st.session_state.questions:
-        build_questions_now()
+@st.fragment
+def _render_question(qs):
+    # answering and moving between questions rerun only this fragment; Finish reruns the app
+    ss = st.session_state
+    total = len(qs)
+    idx = min(ss.q_index, total - 1)
+    # progress lives here because Previous/Next only rerun this fragment
+    st.progress(idx / total, text=f"Question {idx + 1} of {total}")
+    q = qs[idx]
+    st.subheader(f"{idx + 1}. {q.section}")
+    st.write(q.text)
+    # the hint is only emitted when asked for; a collapsed expander would still send it
+    if st.toggle("Why this matters", key="hint_" + q.id):
+        st.info(q.hint)
+
+    answers = ss.answers
+    radio_key = "radio_" + q.id
+    prev = answers.get(q.id)
+    choice = st.radio(
+        "Answer",
+        ANSWER_OPTIONS,
+        horizontal=True,
+        index=ANSWER_INDEX[prev or "Partially or unsure"],
+        key=radio_key,
+        on_change=_store_answer,
+        args=(q.id, radio_key),
+    )
+    # first visit records the default; later changes arrive via _store_answer
+    if choice != prev:
+        _set_answer(q.id, choice)
 
-    qs = st.session_state.questions
+    st.markdown("---")
+    b1, b2, b3 = st.columns([1, 1, 2])
+    b1.button("⬅ Previous", disabled=(idx == 0), on_click=_go_to_question, args=(max(0, idx - 1),))
+    b2.button("Next ➜", disabled=(idx >= total - 1), on_click=_go_to_question, args=(min(total - 1, idx + 1),))
+    if b3.button("Finish and see results ✅", type="primary"):
+        ss.page = "Results"
+        st.rerun()
+
+    with st.expander("Jump to a question"):
+        # number_input is a fixed-size widget, unlike a slider spanning every question
+        st.number_input(
+            "Question number",
+            min_value=1,
+            max_value=max(1, total),
+            value=idx + 1,
+            step=1,
+            key="q_jump",
+            on_change=_jump_to_question,
+        )
+
+def render_questionnaire():
+    ss = st.session_state
+    build_questions_now()  # no-op unless the profile behind questions_key changed
+
+    qs = ss.questions
     total = len(qs)
-    idx = min(st.session_state.q_index, max(0, total - 1))
 
     # Snapshot left + question right
     snap_col, main = st.columns([1, 3], vertical_alignment="top")
@@ -457,113 +482,92 @@ if st.session_state.page == "Questionnaire":
 
     with main:
         st.title("Questionnaire")
-        st.caption(f"{total} questions loaded for {st.session_state.size} in {st.session_state.sector_label}")
-        st.progress((idx) / total if total else 0.0, text=f"Question {idx + 1} of {total}")
+        st.caption(f"{total} questions loaded for {ss.size} in {ss.sector_label}")
 
         if total == 0:
             st.warning("No questions available for the current settings.")
         else:
-            q = qs[idx]
-            st.subheader(f"{idx + 1}. {q['section']}")
-            st.write(q["text"])
-            with st.expander("Why this matters", expanded=False):
-                st.write(q["hint"])
-
-            default_choice = st.session_state.answers.get(q["id"], "Partially or unsure")
-            choice = st.radio(
-                "Answer",
-                ["Yes", "Partially or unsure", "No"],
-                horizontal=True,
-                index={"Yes": 0, "Partially or unsure": 1, "No": 2}[default_choice],
-                key=f"radio_{q['id']}",
-            )
-            st.session_state.answers[q["id"]] = choice
-
-            st.markdown("---")
-            b1, b2, b3 = st.columns([1, 1, 2])
-            if b1.button("⬅ Previous", disabled=(idx == 0)):
-                st.session_state.q_index = max(0, idx - 1)
-                st.rerun()
-            if b2.button("Next ➜", disabled=(idx >= total - 1)):
-                st.session_state.q_index = min(total - 1, idx + 1)
-                st.rerun()
-            if b3.button("Finish and see results ✅", type="primary"):
-                st.session_state.page = "Results"
-                st.rerun()
-
-            with st.expander("Jump to a question"):
-                jump = st.slider("Question number", 1, max(1, total), idx + 1)
-                if jump - 1 != idx:
-                    st.session_state.q_index = jump - 1
-                    st.rerun()
+            _render_question(qs)
 
 # ==========================================================
 # PAGE: Results
 # ==========================================================
-if st.session_state.page == "Results":
-    if not st.session_state.questions:
-        build_questions_now()
-    qs = st.session_state.questions
+def render_results():
+    ss = st.session_state
+    build_questions_now()  # no-op unless the profile behind questions_key changed
+    qs = ss.questions
 
     st.title("Results")
 
     # Profile header
-    person = st.session_state.person_name.strip() or "Anonymous"
-    company = st.session_state.company_name.strip() or "Unnamed business"
-    turnover_label = turnover_label_from_start(st.session_state.turnover_start)
-    st.caption(f"Assessed by **{person}** for **{company}**")
-    st.markdown(
-        f"**Profile:** {st.session_state.employee_range} employees · "
-        f"Turnover: {turnover_label} · "
-        f"Sector: {st.session_state.sector_label} · "
-        f"Detected size: {st.session_state.size.capitalize()}"
+    caption, profile = results_header(
+        ss.person_name,
+        ss.company_name,
+        ss.employee_range,
+        ss.turnover_start,
+        ss.sector_label,
+        ss.size,
     )
+    st.caption(caption)
+    st.markdown(profile)
     st.markdown("---")
 
     if not qs:
         st.warning("No answers yet. Go to the questionnaire page to answer the questions.")
     else:
-        # Section scores
-        section_scores = {}
-        for q in qs:
-            ans = st.session_state.answers.get(q["id"], "Partially or unsure")
-            section_scores.setdefault(q["section"], []).append(score_choice(ans))
-
-        section_avg = {s: sum(vals) / len(vals) for s, vals in section_scores.items() if vals}
-        overall = sum(section_avg.values()) / len(section_avg) if section_avg else 0.0
+        # Section scores: section_totals is kept current by _set_answer, so this is O(sections)
+        answers = ss.answers
+        section_avg = [(s, total / n) for s, (total, n) in ss.section_totals.items()]
+        overall = sum(avg for _, avg in section_avg) / len(section_avg) if section_avg else 0.0
 
         c1, c2, c3 = st.columns(3)
         c1.metric("Overall score (0 to 2)", f"{overall:.2f}")
         c2.metric("Overall status", status_from_avg(overall))
-        c3.metric("Questions answered", f"{len([a for a in st.session_state.answers.values() if a])} / {len(qs)}")
+        # only answers for the current question set count; a profile change can leave stale ids
+        answers_get = answers.get
+        answered = sum(1 for qid in ss.question_ids if answers_get(qid))
+        c3.metric("Questions answered", f"{answered} / {len(qs)}")
 
         st.markdown("### Section scores")
-        for s, avg in sorted(section_avg.items()):
+        for s, avg in section_avg:
             st.write(f"**{s}** — {status_from_avg(avg)} ({avg:.2f})")
 
         # Quick wins
         st.markdown("---")
         st.subheader("Suggested quick wins")
         quick_wins = []
-        for q in qs:
-            ans = st.session_state.answers.get(q["id"], "Partially or unsure")
+        for i in ss.qw_candidates:
+            if len(quick_wins) == MAX_QUICK_WINS:
+                break
+            q = qs[i]
+            ans = answers_get(q.id, "Partially or unsure")
             if ans != "Yes":
-                w = q.get("weights", {"importance": 2, "effort": 2, "impact": 2})
-                if w.get("effort", 2) <= 2 and w.get("impact", 2) >= 2:
-                    quick_wins.append((q, ans))
+                quick_wins.append((q, ans))
         if not quick_wins:
             st.write("Great work. No obvious quick wins based on your answers.")
         else:
-            for q, ans in quick_wins[:8]:
-                st.write(f"- **{q['section']}**: {q['text']} — _Current answer: {ans}_")
+            for q, ans in quick_wins:
+                st.write(f"- **{q.section}**: {q.text} — _Current answer: {ans}_")
 
         st.markdown("---")
         c1, c2 = st.columns(2)
         if c1.button("⬅ Back to questionnaire"):
-            st.session_state.page = "Questionnaire"
+            ss.page = "Questionnaire"
             st.rerun()
         if c2.button("Start over"):
-            st.session_state.answers = {}
-            st.session_state.q_index = 0
-            st.session_state.page = "Questionnaire"
+            ss.answers = {}
+            ss.section_totals = _section_totals(qs, ss.answers)
+            ss.q_index = 0
+            ss.page = "Questionnaire"
             st.rerun()
+
+# =========================
+# Page dispatch — only the active page's function runs on a rerun
+# =========================
+PAGE_RENDERERS = {
+    "Landing": render_landing,
+    "Initial assessment": render_initial_assessment,
+    "Questionnaire": render_questionnaire,
+    "Results": render_results,
+}
+PAGE_RENDERERS[st.session_state.page]()
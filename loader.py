@@ -1,6 +1,13 @@
 import json
+import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Set, Tuple
+from typing import List, Dict, Any, FrozenSet, NamedTuple, Tuple
+
+try:
+    import orjson  # optional; noticeably faster on the larger question files
+except ImportError:
+    orjson = None
 
 ALLOWED_SIZES = {"micro", "small", "medium"}
 ALLOWED_SECTORS = {
@@ -18,6 +25,26 @@ ALLOWED_OVERLAYS = {
     "operational_technology_and_industrial_control",
 }
 ANSWER_TYPES = {"traffic_light"}
+QUESTION_KEYS = ("id", "section", "text", "hint", "answer_type", "weights", "visibility_rules", "framework_references")
+VISIBILITY_KEYS = ("sizes", "sectors", "overlays")
+_QUESTION_KEY_SET = frozenset(QUESTION_KEYS)
+_VISIBILITY_KEY_SET = frozenset(VISIBILITY_KEYS)
+
+class Question(NamedTuple):
+    # a validated question, flattened; immutable so cached copies can be shared safely
+    id: str
+    section: str
+    text: str
+    hint: str
+    answer_type: str
+    importance: float
+    effort: float
+    impact: float
+    sizes: FrozenSet[str]
+    sectors: FrozenSet[str]
+    overlays: FrozenSet[str]
+    framework_references: Tuple[Any, ...]
+    quick_win_eligible: bool
 
 def _require_keys(obj: Dict[str, Any], keys: List[str], ctx: str):
     for k in keys:
@@ -34,20 +61,23 @@ def _validate_weights(w: Dict[str, Any], ctx: str):
             raise ValueError(f"{ctx}: weights['{k}'] must be number")
 
 def _validate_visibility(v: Dict[str, Any], ctx: str):
-    _require_keys(v, ["sizes", "sectors", "overlays"], ctx + ".visibility_rules")
-    if not set(v["sizes"]).issubset(ALLOWED_SIZES):
+    if not v.keys() >= _VISIBILITY_KEY_SET:
+        _require_keys(v, VISIBILITY_KEYS, ctx + ".visibility_rules")
+    # stored back as frozensets so build_question_set filters with hash lookups
+    v["sizes"] = frozenset(v["sizes"])
+    v["sectors"] = frozenset(v["sectors"])
+    v["overlays"] = frozenset(v["overlays"])
+    if not v["sizes"] <= ALLOWED_SIZES:
         raise ValueError(f"{ctx}: visibility_rules.sizes must be subset of {sorted(ALLOWED_SIZES)}")
-    if not set(v["sectors"]).issubset(ALLOWED_SECTORS):
+    if not v["sectors"] <= ALLOWED_SECTORS:
         raise ValueError(f"{ctx}: visibility_rules.sectors must be subset of {sorted(ALLOWED_SECTORS)}")
-    if not set(v["overlays"]).issubset(ALLOWED_OVERLAYS):
+    if not v["overlays"] <= ALLOWED_OVERLAYS:
         raise ValueError(f"{ctx}: visibility_rules.overlays must be subset of {sorted(ALLOWED_OVERLAYS)}")
 
 def validate_question(q: Dict[str, Any]) -> None:
-    _require_keys(
-        q,
-        ["id", "section", "text", "hint", "answer_type", "weights", "visibility_rules", "framework_references"],
-        "question",
-    )
+    # one set comparison on the happy path; the per-key walk only runs to name what is missing
+    if not q.keys() >= _QUESTION_KEY_SET:
+        _require_keys(q, QUESTION_KEYS, "question")
     _require_type(q["id"], str, "question.id")
     _require_type(q["section"], str, "question.section")
     _require_type(q["text"], str, "question.text")
@@ -60,34 +90,67 @@ def validate_question(q: Dict[str, Any]) -> None:
     _validate_weights(q["weights"], "question")
     _validate_visibility(q["visibility_rules"], "question")
 
-def load_questions_from_file(path: Path) -> List[Dict[str, Any]]:
+def _to_question(q: Dict[str, Any]) -> Question:
+    # expects a dict that passed validate_question (visibility rules already frozensets)
+    w = q["weights"]
+    v = q["visibility_rules"]
+    return Question(
+        id=q["id"],
+        # interned so the section dict keys compare by identity. This holds only while app.py
+        # shares these objects (st.cache_resource); a pickling cache would hand back copies.
+        section=sys.intern(q["section"]),
+        text=q["text"],
+        hint=q["hint"],
+        answer_type=q["answer_type"],
+        importance=w["importance"],
+        effort=w["effort"],
+        impact=w["impact"],
+        sizes=v["sizes"],
+        sectors=v["sectors"],
+        overlays=v["overlays"],
+        framework_references=tuple(q["framework_references"]),
+        # low effort, decent impact: the Results page suggests these first
+        quick_win_eligible=w["effort"] <= 2 and w["impact"] >= 2,
+    )
+
+def load_questions_from_file(path: Path) -> List[Question]:
     if not path.exists():
         raise FileNotFoundError(f"Question file not found: {path}")
-    with path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    return list(_load_questions_cached(str(path), path.stat().st_mtime_ns))
+
+@lru_cache(maxsize=32)
+def _load_questions_cached(path_str: str, mtime_ns: int) -> Tuple[Question, ...]:
+    # mtime_ns only feeds the cache key, so an edited file is re-read and re-validated
+    path = Path(path_str)
+    if orjson is not None:
+        data = orjson.loads(path.read_bytes())
+    else:
+        with path.open("r", encoding="utf-8") as f:
+            data = json.load(f)
     if not isinstance(data, list):
         raise ValueError(f"{path}: root must be a list of questions")
     for i, q in enumerate(data, start=1):
         validate_question(q)
-    return data
+    return tuple(_to_question(q) for q in data)
+
+def question_files_mtime(base_dir: Path) -> int:
+    # newest modification time (ns) across the question files; a cache key that changes on edit
+    return max((p.stat().st_mtime_ns for p in (base_dir / "questions").glob("*.json")), default=0)
 
-def merge_unique_by_id(lists: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
-    seen: Set[str] = set()
-    merged: List[Dict[str, Any]] = []
+def merge_unique_by_id(lists: List[List[Question]]) -> List[Question]:
+    # dicts keep insertion order, so the first occurrence of each id wins
+    merged: Dict[str, Question] = {}
     for arr in lists:
         for q in arr:
-            if q["id"] in seen:
-                continue
-            seen.add(q["id"])
-            merged.append(q)
-    return merged
+            merged.setdefault(q.id, q)
+    return list(merged.values())
 
 def build_question_set(
     base_dir: Path,
     size: str,
     sector: str,
     overlay_flags: Dict[str, bool],
-) -> Tuple[List[Dict[str, Any]], List[str]]:
+) -> Tuple[List[Question], List[str]]:
     debug: List[str] = []
     qdir = base_dir / "questions"
 
@@ -101,7 +164,7 @@ def build_question_set(
     sector_q = load_questions_from_file(sector_file) if sector_file.exists() else []
     debug.append(f"Loaded sector_{sector}.json: {len(sector_q)}")
 
-    overlay_q_all: List[Dict[str, Any]] = []
+    overlay_q_all: List[Question] = []
     for overlay_key, enabled in overlay_flags.items():
         if enabled:
             path = qdir / f"overlays_{overlay_key}.json"
@@ -113,13 +176,13 @@ def build_question_set(
 
     merged = merge_unique_by_id([core, size_q, sector_q, overlay_q_all])
 
+    enabled_overlays = frozenset(k for k, enabled in overlay_flags.items() if enabled)
     final = []
     for q in merged:
-        v = q["visibility_rules"]
         if (
-            size in v["sizes"]
-            and (sector in v["sectors"] or "all" in v["sectors"])
-            and all(overlay_flags.get(o, False) for o in v["overlays"])
+            size in q.sizes
+            and (sector in q.sectors or "all" in q.sectors)
+            and q.overlays <= enabled_overlays
         ):
             final.append(q)
 
@@ -0,0 +1,204 @@
+# Option lists, lookup tables and pure formatting helpers for app.py.
+# Streamlit re-executes app.py on every rerun; anything defined here is built once per
+# process, and the lru_caches below survive across reruns and sessions.
+import sys
+from bisect import bisect_right
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Tuple
+
+PAGES = ("Landing", "Initial assessment", "Questionnaire", "Results")
+
+# Profile values owned by key= widgets on Landing / Initial assessment
+WIDGET_DEFAULTS = MappingProxyType({
+    "person_name": "",
+    "company_name": "",
+    "employee_range": "1–5",
+    "turnover_start": 0,               # start of the selected 100k band (via dropdown)
+    "sector_label": "Retail & Hospitality",
+    "card_payments": True,
+    "personal_data": True,
+    "industrial_systems": False,
+
+    # Initial assessment extras (Business profile + Digital footprint)
+    "bp_it_manager": "Self-managed",
+    "bp_asset_inventory": "Partially",
+    "bp_byod": "Sometimes",
+    "bp_sensitive_data": "Yes",
+    "dp_has_website": "Yes",
+    "dp_https": "Yes",
+    "dp_business_email": "Yes",
+    "dp_social_media": "Yes",
+    "dp_public_review": "Sometimes",
+
+    # Snapshot-related inputs
+    "years_in_business": "<1 year",
+    "work_mode": "Local & in-person",
+})
+
+# session_state defaults; app.py copies each value into a session that lacks the key
+DEFAULTS = MappingProxyType({
+    "page": "Landing",                 # Landing → Initial assessment → Questionnaire → Results
+    "rendered_page": None,             # page of the previous run; see the widget re-pin in app.py
+    **WIDGET_DEFAULTS,
+    "size": "micro",                   # derived from turnover_start
+    "sector_key": "hospitality_retail",  # derived from sector_label
+
+    "questions": (),
+    "questions_by_id": {},             # {question_id: question} for the current set
+    "question_ids": [],                # question ids in display order
+    "section_totals": {},              # {section: [score sum, count]}, updated as answers change
+    "questions_key": None,             # (size, sector_key, overlay items) the questions were built for
+    "qw_candidates": (),               # indices into questions that could be quick wins
+    "answers": {},                     # {question_id: "Yes" | "Partially or unsure" | "No"}
+    "q_index": 0,                      # current question index
+    "debug": False,
+})
+
+EMPLOYEE_RANGES = ["1–5", "6–10", "10–25", "26–50", "51–100", "More than 100"]
+
+SECTOR_LABEL_TO_KEY = {
+    "Retail & Hospitality": "hospitality_retail",
+    "Professional / Consulting / Legal / Accounting": "professional_services",
+    "Manufacturing / Logistics": "manufacturing_logistics",
+    "Creative / Marketing / IT Services": "creative_digital_marketing",
+    "Health / Wellness / Education": "health_wellness_education",
+    "Others (default generic set)": "other_generic",  # no sector file; generic only
+}
+SECTOR_LABELS = list(SECTOR_LABEL_TO_KEY.keys())
+
+YEARS_OPTIONS = ["<1 year", "1–3 years", "4–10 years", "10+ years"]
+WORK_MODE_OPTIONS = ["Local & in-person", "Online/remote", "A mix of both"]
+
+# Business profile / digital footprint answer sets
+IT_MANAGER_OPTIONS = ("Self-managed", "Outsourced IT", "Shared responsibility", "Not sure")
+YES_PARTIALLY_NO_NOT_SURE = ("Yes", "Partially", "No", "Not sure")
+YES_SOMETIMES_NO_NOT_SURE = ("Yes", "Sometimes", "No", "Not sure")
+YES_NO_NOT_SURE = ("Yes", "No", "Not sure")
+YES_NO = ("Yes", "No")
+YES_NO_PARTIALLY = ("Yes", "No", "Partially")
+YES_SOMETIMES_NO = ("Yes", "Sometimes", "No")
+
+# questionnaire answers, with the radio's {option: index} map and their scores. Interned:
+# the radio hands back these same objects, so SCORE_MAP lookups on stored answer values
+# match by identity.
+ANSWER_OPTIONS = tuple(map(sys.intern, ("Yes", "Partially or unsure", "No")))
+ANSWER_INDEX = {opt: i for i, opt in enumerate(ANSWER_OPTIONS)}
+SCORE_MAP = dict(zip(ANSWER_OPTIONS, (2, 1, 0)))
+MAX_QUICK_WINS = 8
+
+# an average at or above STATUS_THRESHOLDS[i] earns STATUS_LABELS[i + 1]
+STATUS_THRESHOLDS = (0.8, 1.6)
+STATUS_LABELS = ("🟥 At risk", "🟨 Needs improvement", "🟩 Good")
+
+def status_from_avg(avg: float) -> str:
+    return STATUS_LABELS[bisect_right(STATUS_THRESHOLDS, avg)]
+
+def euro_short(n: int) -> str:
+    # 100_000 -> "€100k", 5_000_000 -> "€5.0M"
+    if n >= 1_000_000:
+        return f"€{n/1_000_000:.1f}M"
+    return f"€{n//1000}k"
+
+@lru_cache(maxsize=256)
+def euro_fmt(n: int) -> str:
+    if n >= 1_000_000:
+        return f"{n//1_000_000} million euro"
+    return f"{n//1_000} thousand euro"
+
+# 100k-step bands 0 → 9.9M, then two sentinels for larger buckets
+TURNOVER_STARTS_100K = list(range(0, 10_000_000, 100_000))  # 0, 100k, ..., 9.9M
+TURNOVER_SENTINELS = [10_000_000, 50_000_000]                # 10–<50M, 50M+
+TURNOVER_STARTS_ALL = TURNOVER_STARTS_100K + TURNOVER_SENTINELS
+
+def _format_turnover_label(start: int) -> str:
+    if start < 100_000:
+        return "<€100k"
+    if start < 10_000_000:
+        return euro_short(start)
+    if start == 10_000_000:
+        return "€10.0M–<€50.0M"
+    return "€50.0M+"
+
+# every selectable turnover start formatted once; the helper below is a plain lookup
+START_TO_LABEL = {s: _format_turnover_label(s) for s in TURNOVER_STARTS_ALL}
+
+def turnover_label_from_start(start: int) -> str:
+    return START_TO_LABEL.get(start, "<€100k")
+
+# turnover selectbox options: the starts themselves, shown via turnover_label_from_start
+TURNOVER_STARTS = tuple(START_TO_LABEL)
+
+def size_from_turnover_start(start: int) -> str:
+    if start < 2_000_000:
+        return "micro"
+    if start < 10_000_000:
+        return "small"
+    return "medium"  # 10–<50M and 50M+ treated as medium
+
+@lru_cache(maxsize=32)
+def digital_dependency(
+    card_payments: bool,
+    personal_data: bool,
+    industrial_systems: bool,
+    turnover_start: int,
+    employee_range: str,
+) -> str:
+    """
+    Simple heuristic based on inputs commonly linked to online reliance.
+    Score (0–5):
+      +1 card_payments, +1 personal_data, +2 industrial_systems,
+      +1 if turnover >= €1M, +1 if employees >= 51.
+    """
+    score = 0
+    score += 1 if card_payments else 0
+    score += 1 if personal_data else 0
+    score += 2 if industrial_systems else 0
+    score += 1 if turnover_start >= 1_000_000 else 0
+    # employees rough check
+    if employee_range in ["51–100", "More than 100"]:
+        score += 1
+    if score <= 1:
+        return "Low"
+    if score <= 3:
+        return "Medium"
+    return "High"
+
+@lru_cache(maxsize=32)
+def snapshot_markdown(
+    company: str,
+    sector_label: str,
+    employees: str,
+    years: str,
+    turnover_start: int,
+    work_mode: str,
+) -> str:
+    # unchanged snapshot inputs (the usual case while answering) reuse the formatted text
+    return (
+        f"**Business:** {company or '—'}  \n"
+        f"**Industry:** {sector_label or '—'}  \n"
+        f"**People:** {employees or '—'}  • "
+        f"**Years:** {years or '—'}  • "
+        f"**Turnover:** {turnover_label_from_start(turnover_start)}  \n"
+        f"**Work mode:** {work_mode or '—'}"
+    )
+
+@lru_cache(maxsize=32)
+def results_header(
+    person_name: str,
+    company_name: str,
+    employee_range: str,
+    turnover_start: int,
+    sector_label: str,
+    size: str,
+) -> Tuple[str, str]:
+    # (caption, profile line) for Results; keyed on the raw inputs, so an edit is never stale
+    person = person_name.strip() or "Anonymous"
+    company = company_name.strip() or "Unnamed business"
+    return (
+        f"Assessed by **{person}** for **{company}**",
+        f"**Profile:** {employee_range} employees · "
+        f"Turnover: {turnover_label_from_start(turnover_start)} · "
+        f"Sector: {sector_label} · "
+        f"Detected size: {size.capitalize()}",
+    )